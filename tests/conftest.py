@@ -0,0 +1,80 @@
+"""Shared fixtures for the test suite.
+
+No test touches the network. Requests are answered by `FakeAdapter`, which is
+mounted on the session of the handler under test.
+"""
+import io
+from typing import Callable, List, Optional, Tuple, Union
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from wallhaven.cache import TTLCache
+from wallhaven.session import RequestHandler
+
+# A status code, a body and (optionally) the response headers.
+FakeResponse = Tuple[int, bytes, Optional[dict]]
+
+
+class FakeAdapter(BaseAdapter):
+    """A transport adapter that answers requests without touching the network.
+
+    `respond` is called with each `PreparedRequest` and returns either a
+    `FakeResponse` or an exception, which is raised as if the request had failed.
+    """
+
+    def __init__(
+        self,
+        respond: Callable[[requests.PreparedRequest], Union[FakeResponse, Exception]],
+    ) -> None:
+        super().__init__()
+        self.respond = respond
+        self.requests: List[requests.PreparedRequest] = []
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.requests.append(request)
+        result = self.respond(request)
+        if isinstance(result, Exception):
+            raise result
+
+        status_code, content, headers = result
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        response.raw = io.BytesIO(content)
+        response.headers = CaseInsensitiveDict(headers or {})
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def ok(content: bytes = b"{}", **headers: str) -> FakeResponse:
+    """Return a `200 - OK` response."""
+    return 200, content, headers
+
+
+@pytest.fixture
+def cache() -> TTLCache:
+    return TTLCache()
+
+
+@pytest.fixture
+def make_handler(cache: TTLCache):
+    """Return a factory of handlers whose requests are answered by `respond`."""
+    handlers: List[RequestHandler] = []
+
+    def make(respond) -> Tuple[RequestHandler, FakeAdapter]:
+        handler = RequestHandler(cache=cache)
+        adapter = FakeAdapter(respond)
+        handler.session.mount("https://", adapter)
+        handlers.append(handler)
+        return handler, adapter
+
+    yield make
+    for handler in handlers:
+        handler.close()
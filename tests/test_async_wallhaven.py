@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from tests.test_models import WALLPAPER
+from wallhaven.api import AsyncWallhaven
+from wallhaven.models import Wallpaper
+from wallhaven.ratelimit import AsyncSlidingWindowLimiter
+
+
+def listing(url: httpx.URL, last_page: int, seed=None) -> httpx.Response:
+    page = int(url.params.get("page", 1))
+    body = {
+        "data": [{**WALLPAPER, "id": f"page{page}"}],
+        "meta": {
+            "current_page": page,
+            "last_page": last_page,
+            "per_page": 24,
+            "total": last_page,
+            "seed": seed,
+        },
+    }
+    return httpx.Response(200, content=json.dumps(body).encode())
+
+
+@pytest.fixture
+def make_client():
+    def make(respond):
+        requests = []
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return respond(request)
+
+        wallhaven = AsyncWallhaven()
+        wallhaven._limiter = AsyncSlidingWindowLimiter(limit=1000)
+        wallhaven._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handle),
+            event_hooks={"response": [wallhaven._check_for_errors]},
+        )
+        return wallhaven, requests
+
+    return make
+
+
+def test_get_full_collection_listing(make_client):
+    wallhaven, requests = make_client(lambda request: listing(request.url, 3))
+
+    results = asyncio.run(wallhaven.get_full_collection_listing("user", 1))
+
+    assert [w.id for w in results.data] == ["page1", "page2", "page3"]
+    assert results.meta.current_page == 1
+    assert results.meta.request_url.endswith("/collections/user/1")
+    assert len(requests) == 3
+
+
+def test_search_pages_passes_the_seed(make_client):
+    wallhaven, requests = make_client(lambda request: listing(request.url, 10, "abc"))
+    wallhaven.params["sorting"] = "random"
+
+    results = asyncio.run(wallhaven.search_pages(max_pages=3, concurrency=2))
+
+    assert [w.id for w in results.data] == ["page1", "page2", "page3"]
+    assert "seed" not in requests[0].url.params
+    assert all(r.url.params["seed"] == "abc" for r in requests[1:])
+    assert wallhaven.params == {"sorting": "random"}
+
+
+def test_get_collections_without_data(make_client):
+    wallhaven, requests = make_client(lambda request: httpx.Response(200, json={}))
+
+    assert asyncio.run(wallhaven.get_collections("user")) == []
+
+
+@pytest.fixture
+def wallpaper_host(monkeypatch):
+    """Answer the downloads of `save_wallpapers` with `respond`."""
+
+    def mock(respond):
+        requests = []
+        client = httpx.AsyncClient
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return respond(request)
+
+        def make_client(**kwargs) -> httpx.AsyncClient:
+            return client(transport=httpx.MockTransport(handle), **kwargs)
+
+        monkeypatch.setattr(httpx, "AsyncClient", make_client)
+        return requests
+
+    return mock
+
+
+def test_save_wallpapers(wallpaper_host, tmp_path):
+    requests = wallpaper_host(lambda request: httpx.Response(200, content=b"image"))
+    wallpaper = Wallpaper.from_listing_data(WALLPAPER)
+
+    asyncio.run(AsyncWallhaven().save_wallpapers([wallpaper], tmp_path))
+
+    filepath = tmp_path / f"wallhaven-{wallpaper.id}{wallpaper.extension}"
+    assert filepath.read_bytes() == b"image"
+    assert [p.name for p in tmp_path.iterdir()] == [filepath.name]
+    assert len(requests) == 1
+
+
+def test_save_wallpapers_skips_existing_files(wallpaper_host, tmp_path):
+    requests = wallpaper_host(lambda request: httpx.Response(200, content=b"image"))
+    wallpaper = Wallpaper.from_listing_data(WALLPAPER)
+    filepath = tmp_path / f"wallhaven-{wallpaper.id}{wallpaper.extension}"
+    filepath.write_bytes(b"old")
+
+    asyncio.run(AsyncWallhaven().save_wallpapers([wallpaper], tmp_path))
+
+    assert filepath.read_bytes() == b"old"
+    assert requests == []
+
+
+def test_failed_download_leaves_no_file(wallpaper_host, tmp_path):
+    wallpaper_host(lambda request: httpx.Response(404))
+    wallpaper = Wallpaper.from_listing_data(WALLPAPER)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(AsyncWallhaven().save_wallpapers([wallpaper], tmp_path))
+
+    assert list(tmp_path.iterdir()) == []
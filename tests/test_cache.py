@@ -0,0 +1,67 @@
+from wallhaven import cache as cache_module
+from wallhaven.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_entry_expires_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = TTLCache(ttl=60)
+    cache.set("key", b"content")
+
+    clock.now += 30
+    entry = cache.get("key")
+    assert entry is not None
+    assert entry.content == b"content"
+    assert not entry.is_stale()
+
+    clock.now += 1
+    assert cache.get("key").is_stale()
+
+    clock.now += 30
+    assert cache.get("key") is None
+    assert cache.get("key", include_expired=True).content == b"content"
+
+
+def test_ttl_can_be_given_per_entry(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = TTLCache(ttl=60)
+    cache.set("short", b"a", ttl=10)
+    cache.set("long", b"b")
+
+    clock.now += 11
+    assert cache.get("short") is None
+    assert cache.get("long") is not None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", b"a")
+    cache.set("b", b"b")
+
+    # Reading "a" makes "b" the least recently used entry.
+    cache.get("a")
+    cache.set("c", b"c")
+
+    assert len(cache) == 2
+    assert cache.get("b", include_expired=True) is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_clear_removes_every_entry():
+    cache = TTLCache()
+    cache.set("a", b"a")
+    cache.set("b", b"b")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get("a", include_expired=True) is None
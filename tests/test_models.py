@@ -0,0 +1,168 @@
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from wallhaven.models import SearchResults, Wallpaper
+from wallhaven.models import api as models_api
+
+TAG = {
+    "id": 1,
+    "name": "nature",
+    "alias": "",
+    "category": "Nature",
+    "category_id": 5,
+    "purity": "sfw",
+    "created_at": "2014-02-02 23:23:48",
+}
+UPLOADER = {"username": "user", "group": "User", "avatar": {}}
+WALLPAPER = {
+    "id": "8oxreo",
+    "url": "https://wallhaven.cc/w/8oxreo",
+    "short_url": "https://whvn.cc/8oxreo",
+    "views": 10,
+    "favorites": 2,
+    "source": "",
+    "purity": "sfw",
+    "category": "general",
+    "dimension_x": 1920,
+    "dimension_y": 1080,
+    "resolution": "1920x1080",
+    "ratio": "1.78",
+    "file_size": 1234567,
+    "file_type": "image/png",
+    "created_at": "2015-01-21 12:34:11",
+    "colors": ["#000000"],
+    "path": "https://w.wallhaven.cc/full/8o/wallhaven-8oxreo.png",
+    "thumbs": {"large": "https://th.wallhaven.cc/lg/8o/8oxreo.jpg"},
+}
+
+
+@pytest.fixture
+def wallpaper() -> Wallpaper:
+    return Wallpaper.from_listing_data(WALLPAPER)
+
+
+@pytest.mark.parametrize("name", ["id", "foo"])
+def test_frozen_model_rejects_assignment(wallpaper, name):
+    with pytest.raises(FrozenInstanceError):
+        setattr(wallpaper, name, "value")
+
+
+@pytest.mark.parametrize("name", ["id", "foo"])
+def test_frozen_model_rejects_deletion(wallpaper, name):
+    with pytest.raises(FrozenInstanceError):
+        delattr(wallpaper, name)
+
+
+def test_models_are_slotted(wallpaper):
+    assert not hasattr(wallpaper, "__dict__")
+
+
+def test_frozen_model_can_be_pickled():
+    wallpaper = Wallpaper.from_dict({**WALLPAPER, "tags": [TAG], "uploader": UPLOADER})
+    assert pickle.loads(pickle.dumps(wallpaper)) == wallpaper
+
+
+class FakeHandler:
+    """Records the downloads instead of requesting them."""
+
+    def __init__(self) -> None:
+        self.downloads = []
+
+    def download(self, url, filepath, **kwargs) -> None:
+        self.downloads.append(filepath)
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    handler = FakeHandler()
+    monkeypatch.setattr(models_api, "handler", handler)
+    return handler.downloads
+
+
+def test_save_skips_existing_files(wallpaper, tmp_path, downloads):
+    (tmp_path / "wallhaven-8oxreo.png").write_bytes(b"")
+
+    wallpaper.save(tmp_path)
+    assert downloads == []
+
+    wallpaper.save(tmp_path, override=True)
+    assert downloads == [tmp_path / "wallhaven-8oxreo.png"]
+
+
+def test_save_writes_through_dangling_symlinks(wallpaper, tmp_path, downloads):
+    link = tmp_path / "wallhaven-8oxreo.png"
+    link.symlink_to(tmp_path / "missing.png")
+
+    wallpaper.save(tmp_path)
+    assert downloads == [link]
+
+
+@pytest.fixture
+def results() -> SearchResults:
+    return SearchResults.from_dict(
+        {
+            "data": [{**WALLPAPER, "id": f"id{i}"} for i in range(5)],
+            "meta": {"current_page": 1, "last_page": 1, "per_page": 24, "total": 5},
+        }
+    )
+
+
+def test_listing_wallpapers_are_created_on_first_access(results):
+    assert len(results.data) == 5
+    assert results.data._wallpapers == [None] * 5
+
+    first = results.data[0]
+    assert first.id == "id0"
+    assert results.data[0] is first
+    assert results.data._wallpapers.count(None) == 4
+
+
+def test_listing_supports_negative_indices_and_slices(results):
+    assert results.data[-1].id == "id4"
+    assert [w.id for w in results.data[1:3]] == ["id1", "id2"]
+    assert [w.id for w in results.data[::-2]] == ["id4", "id2", "id0"]
+    assert results.data[10:] == []
+    with pytest.raises(IndexError):
+        results.data[5]
+
+
+def test_listing_iterates_over_the_same_wallpapers(results):
+    assert [w.id for w in results.data] == [f"id{i}" for i in range(5)]
+    assert list(results.data) == list(results.data)
+    assert results.data == list(results.data)
+    assert all(a is b for a, b in zip(results.data, results.data))
+
+
+def test_listing_as_dict(results):
+    data = results.as_dict()
+
+    # Wallpapers in a listing come without tags and uploader.
+    expected = {**WALLPAPER, "tags": [], "uploader": None}
+    assert data["data"] == [{**expected, "id": f"id{i}"} for i in range(5)]
+    assert data["meta"]["total"] == 5
+    assert data["meta"]["seed"] is None
+
+
+def test_from_dict_passes_fields_by_name():
+    wallpaper = Wallpaper.from_dict({**WALLPAPER, "tags": [TAG], "uploader": UPLOADER})
+
+    assert wallpaper.id == "8oxreo"
+    assert wallpaper.tags[0].name == "nature"
+    assert wallpaper.uploader.username == "user"
+
+
+def test_from_dict_raises_key_error_for_missing_fields():
+    data = {**WALLPAPER, "tags": [], "uploader": UPLOADER}
+    del data["views"]
+
+    with pytest.raises(KeyError):
+        Wallpaper.from_dict(data)
+    with pytest.raises(KeyError):
+        Wallpaper.from_listing_data(data)
+
+
+def test_lazy_wallpapers_are_not_hashable():
+    with pytest.raises(TypeError):
+        hash(models_api._LazyWallpapers([WALLPAPER]))
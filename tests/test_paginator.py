@@ -0,0 +1,40 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from wallhaven.api.paginator import Paginator
+
+
+def page(number: int, last_page: int = 3) -> SimpleNamespace:
+    return SimpleNamespace(number=number, meta=SimpleNamespace(last_page=last_page))
+
+
+def test_pages_are_fetched_in_order():
+    assert [p.number for p in Paginator(page)] == [1, 2, 3]
+
+
+def test_failed_page_is_requested_again():
+    failures = [ConnectionError("offline")]
+
+    def fetch_page(number: int) -> SimpleNamespace:
+        if number == 2 and failures:
+            raise failures.pop()
+        return page(number)
+
+    paginator = Paginator(fetch_page)
+    assert next(paginator).number == 1
+    with pytest.raises(ConnectionError):
+        next(paginator)
+    assert next(paginator).number == 2
+
+
+def test_close_cancels_the_pending_page():
+    paginator = Paginator(page)
+    pending = paginator._pending = Future()
+
+    paginator.close()
+
+    assert pending.cancelled()
+    with pytest.raises(StopIteration):
+        next(paginator)
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from wallhaven import ratelimit
+from wallhaven.api import AsyncWallhaven
+from wallhaven.ratelimit import (
+    AsyncSlidingWindowLimiter,
+    SlidingWindowLimiter,
+    backoff,
+    parse_retry_after,
+)
+
+
+class FakeTime:
+    """Stands in for the `time` module, so the limiter never really sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def time(self) -> float:
+        return time.time()
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeTime:
+    clock = FakeTime()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+def test_limiter_waits_once_the_window_is_full(clock):
+    limiter = SlidingWindowLimiter(limit=2, window=60)
+
+    limiter.acquire()
+    clock.now += 10
+    limiter.acquire()
+    assert clock.sleeps == []
+
+    # The third request must wait until the first one leaves the window.
+    limiter.acquire()
+    assert clock.sleeps == [50]
+
+
+def test_limiter_forgets_requests_outside_the_window(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60)
+
+    limiter.acquire()
+    clock.now += 61
+    limiter.acquire()
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("30", 30.0),
+        ("1.5", 1.5),
+        ("-5", 0.0),
+        ("soon", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_with_future_date():
+    value = formatdate(time.time() + 120, usegmt=True)
+    assert 115 <= parse_retry_after(value) <= 120
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    for attempt, delay in enumerate([0.5, 1.0, 2.0, 4.0]):
+        assert delay <= backoff(attempt) <= delay + 0.5
+    assert 30.0 <= backoff(20) <= 30.5
+
+
+def test_async_instances_share_the_limiter():
+    first, second = AsyncWallhaven(), AsyncWallhaven()
+    assert first._limiter is second._limiter is ratelimit.async_limiter
+
+
+def test_async_limiter_can_be_used_from_several_loops():
+    limiter = AsyncSlidingWindowLimiter(limit=10)
+    asyncio.run(limiter.acquire())
+    asyncio.run(limiter.acquire())
+    assert len(limiter._calls) == 2
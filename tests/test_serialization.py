@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from wallhaven import serialization
+
+DATA = {"name": "café", "tags": [1, 2.5, None, True], "nested": {"a": "日本"}}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_output_does_not_depend_on_orjson(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert serialization.dumps(DATA) == (
+        '{"name":"café","tags":[1,2.5,null,true],"nested":{"a":"日本"}}'
+    )
+
+
+def test_loads_round_trips_dumps():
+    assert serialization.loads(serialization.dumps(DATA)) == DATA
+    assert serialization.loads(serialization.dumps(DATA).encode()) == DATA
+    assert json.loads(serialization.dumps(DATA)) == DATA
@@ -0,0 +1,212 @@
+import threading
+
+import pytest
+import requests
+
+from tests.conftest import ok
+from tests.test_cache import FakeClock
+from wallhaven import cache as cache_module
+from wallhaven import session
+from wallhaven.exceptions import TooManyRequestsError
+
+URL = "https://wallhaven.cc/api/v1/w/8oxreo"
+
+
+def test_response_is_cached(make_handler):
+    handler, adapter = make_handler(lambda request: ok(b'{"data": 1}'))
+
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+    assert len(adapter.requests) == 1
+
+
+def test_responses_are_not_cached_without_ttl(make_handler):
+    handler, adapter = make_handler(lambda request: ok())
+
+    handler.get_json(URL)
+    handler.get_json(URL)
+    assert len(adapter.requests) == 2
+
+
+def test_params_are_part_of_the_cache_key(make_handler, cache):
+    def respond(request):
+        return ok(b'{"q": "%s"}' % request.url[-1:].encode())
+
+    handler, adapter = make_handler(respond)
+
+    assert handler.get_json(URL, ttl=60, params={"q": "a"}) == {"q": "a"}
+    assert handler.get_json(URL, ttl=60, params={"q": "b"}) == {"q": "b"}
+    assert [r.url for r in adapter.requests] == [URL + "?q=a", URL + "?q=b"]
+    assert cache.get(URL + "?q=a") is not None
+
+
+def test_concurrent_requests_are_coalesced(make_handler):
+    release = threading.Event()
+
+    def respond(request):
+        release.wait(timeout=5)
+        return ok(b'{"data": 1}')
+
+    handler, adapter = make_handler(respond)
+    results = []
+
+    def fetch():
+        results.append(handler._fetch(URL, 60))
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    # Give every thread the chance to find the request in flight before it's done.
+    threading.Event().wait(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == [b'{"data": 1}'] * 4
+    assert len(adapter.requests) == 1
+    assert handler._inflight == {}
+
+
+def test_coalesced_requests_share_the_error(make_handler):
+    release = threading.Event()
+
+    def respond(request):
+        release.wait(timeout=5)
+        return 500, b"", None
+
+    handler, adapter = make_handler(respond)
+    errors = []
+
+    def fetch():
+        try:
+            handler._fetch(URL, 60)
+        except requests.HTTPError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=fetch) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    threading.Event().wait(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(errors) == 2
+    assert len(adapter.requests) == 1
+
+
+def test_expired_entry_is_revalidated_with_etag(make_handler, cache):
+    handler, adapter = make_handler(lambda request: (304, b"", {"ETag": '"abc"'}))
+    cache.set(URL, b'{"data": 1}', ttl=-1, etag='"abc"')
+
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+    assert adapter.requests[0].headers["If-None-Match"] == '"abc"'
+
+    # The entry is renewed, so the next call doesn't hit the network.
+    entry = cache.get(URL)
+    assert entry is not None
+    assert entry.content == b'{"data": 1}'
+    handler.get_json(URL, ttl=60)
+    assert len(adapter.requests) == 1
+
+
+def test_etag_is_kept_when_not_modified_response_omits_it(make_handler, cache):
+    handler, adapter = make_handler(lambda request: (304, b"", None))
+    cache.set(URL, b'{"data": 1}', ttl=-1, etag='"abc"')
+
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+    assert cache.get(URL).etag == '"abc"'
+
+
+def test_modified_response_replaces_the_entry(make_handler, cache):
+    handler, adapter = make_handler(lambda request: ok(b'{"data": 2}', ETag='"def"'))
+    cache.set(URL, b'{"data": 1}', ttl=-1, etag='"abc"')
+
+    assert handler.get_json(URL, ttl=60) == {"data": 2}
+    assert cache.get(URL).etag == '"def"'
+
+
+def test_expired_entry_is_used_when_offline(make_handler, cache):
+    handler, adapter = make_handler(lambda request: requests.ConnectionError())
+    cache.set(URL, b'{"data": 1}', ttl=-1)
+
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+
+    # The entry is left expired, so the next call tries the network again.
+    assert cache.get(URL) is None
+    handler.get_json(URL, ttl=60)
+    assert len(adapter.requests) == 2
+
+
+def test_connection_errors_are_raised_without_a_cached_entry(make_handler):
+    handler, adapter = make_handler(lambda request: requests.Timeout())
+
+    with pytest.raises(requests.Timeout):
+        handler.get_json(URL, ttl=60)
+
+
+class CountingLimiter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def acquire(self) -> None:
+        self.calls += 1
+
+
+def test_too_many_requests_is_retried_through_the_limiter(make_handler, monkeypatch):
+    responses = iter([(429, b"", {"Retry-After": "2"}), ok(b'{"data": 1}')])
+    handler, adapter = make_handler(lambda request: next(responses))
+    handler.limiter = CountingLimiter()
+    sleeps = []
+    monkeypatch.setattr(session.time, "sleep", sleeps.append)
+
+    assert handler.get_json(URL) == {"data": 1}
+    assert handler.limiter.calls == 2
+    assert len(sleeps) == 1 and sleeps[0] >= 2
+
+
+def test_too_many_requests_is_raised_after_all_retries(make_handler, monkeypatch):
+    handler, adapter = make_handler(lambda request: (429, b"", None))
+    monkeypatch.setattr(session.time, "sleep", lambda seconds: None)
+
+    with pytest.raises(TooManyRequestsError):
+        handler.get_json(URL)
+    assert len(adapter.requests) == handler.retries + 1
+
+
+@pytest.fixture
+def stale(monkeypatch, cache):
+    """Store an entry for `URL` that is stale, but still valid."""
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache.set(URL, b'{"data": 1}', ttl=60)
+    clock.now += 40
+
+
+def test_stale_entry_is_refreshed_in_the_background(make_handler, cache, stale):
+    handler, adapter = make_handler(lambda request: ok(b'{"data": 2}'))
+
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+    handler._refresher.shutdown(wait=True)
+    assert len(adapter.requests) == 1
+    assert cache.get(URL).content == b'{"data": 2}'
+    assert handler._refreshing == set()
+
+
+def test_stale_entry_is_returned_after_close(make_handler, stale):
+    handler, adapter = make_handler(lambda request: ok(b'{"data": 2}'))
+    handler.close()
+
+    assert handler.get_json(URL, ttl=60) == {"data": 1}
+    assert adapter.requests == []
+
+
+def test_download_writes_the_whole_body(make_handler, tmp_path):
+    body = bytes(range(256)) * 10000
+    handler, adapter = make_handler(lambda request: ok(body))
+    filepath = tmp_path / "missing" / "wallhaven-8oxreo.png"
+
+    handler.download("https://w.wallhaven.cc/full/8o/wallhaven-8oxreo.png", filepath)
+
+    assert filepath.read_bytes() == body
@@ -0,0 +1,50 @@
+import threading
+
+from tests.conftest import FakeAdapter, ok
+from tests.test_models import TAG
+from wallhaven.api import Wallhaven
+from wallhaven.serialization import dumps
+
+RESULTS = {
+    "data": [],
+    "meta": {"current_page": 1, "last_page": 1, "per_page": 24, "total": 0},
+}
+
+
+def test_max_workers_is_capped_at_the_pool_size():
+    wallhaven = Wallhaven(cache=False, concurrency=2)
+    wallhaven.handler.limiter = None
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def respond(request):
+        with lock:
+            active.append(request)
+            peak.append(len(active))
+        threading.Event().wait(0.02)
+        with lock:
+            active.remove(request)
+        return ok(dumps({"data": TAG}).encode())
+
+    wallhaven.handler.session.mount("https://", FakeAdapter(respond))
+    with wallhaven:
+        tags = wallhaven.get_tags(range(6), max_workers=16)
+
+    assert len(tags) == 6
+    assert max(peak) <= 2
+
+
+def test_search_with_params_leaves_self_params_alone():
+    wallhaven = Wallhaven(cache=False)
+    wallhaven.handler.limiter = None
+    wallhaven.params["q"] = "nature"
+    adapter = FakeAdapter(lambda request: ok(dumps(RESULTS).encode()))
+    wallhaven.handler.session.mount("https://", adapter)
+
+    with wallhaven:
+        wallhaven.search()
+        wallhaven.search({"q": "anime"})
+
+    assert [r.url.split("?")[1] for r in adapter.requests] == ["q=nature", "q=anime"]
+    assert wallhaven.params == {"q": "nature"}
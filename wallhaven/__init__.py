@@ -0,0 +1,84 @@
+"""Shortcuts to the most common requests, sent through a shared `Wallhaven` client.
+
+Usage:
+
+>>> import wallhaven
+>>> wallhaven.get_wallpaper("8oxreo")
+<Wallpaper(id='8oxreo', ...)>
+
+Every function uses the same client, so connections and cached responses are
+reused across the whole process. The client is only created on the first call and
+it's closed when the interpreter exits. Use `wallhaven.api.Wallhaven` directly for
+anything else, e.g. to pass a different API key or to paginate results.
+"""
+import atexit
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+
+if TYPE_CHECKING:
+    from wallhaven.api import Wallhaven
+    from wallhaven.models import (
+        Collection,
+        CollectionListing,
+        SearchResults,
+        Tag,
+        Wallpaper,
+    )
+
+_default: Optional["Wallhaven"] = None
+_default_lock = threading.Lock()
+
+
+def _get_default() -> "Wallhaven":
+    """Return the shared client, creating it on the first call."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            # Imported here, since `wallhaven.api` imports submodules of this package.
+            from wallhaven.api import Wallhaven
+
+            _default = Wallhaven()
+            atexit.register(_default.close)
+        return _default
+
+
+def get_wallpaper(wallpaper_id: str) -> "Wallpaper":
+    """Get wallpaper from a given ID. See `Wallhaven.get_wallpaper`."""
+    return _get_default().get_wallpaper(wallpaper_id)
+
+
+def get_wallpapers(wallpaper_ids: Iterable[str]) -> List["Wallpaper"]:
+    """Get several wallpapers at once. See `Wallhaven.get_wallpapers`."""
+    return _get_default().get_wallpapers(wallpaper_ids)
+
+
+def get_tag(tag_id: Union[str, int]) -> "Tag":
+    """Get tag from a given ID. See `Wallhaven.get_tag`."""
+    return _get_default().get_tag(tag_id)
+
+
+def get_tags(tag_ids: Iterable[Union[str, int]]) -> List["Tag"]:
+    """Get several tags at once. See `Wallhaven.get_tags`."""
+    return _get_default().get_tags(tag_ids)
+
+
+def get_collections(username: str) -> List["Collection"]:
+    """Get the public collections of a given user. See `Wallhaven.get_collections`."""
+    return _get_default().get_collections(username)
+
+
+def get_collection_listing(username: str, collection_id: int) -> "CollectionListing":
+    """Get the listing of wallpapers from a collection.
+
+    See `Wallhaven.get_collection_listing`.
+    """
+    return _get_default().get_collection_listing(username, collection_id)
+
+
+def search(**params: Any) -> "SearchResults":
+    """Perform a search with the given parameters. See `Wallhaven.search`.
+
+    The parameters are only used for this search, they are not stored in the shared
+    client, e.g. `wallhaven.search(q="nature", sorting="toplist")`.
+    """
+    return _get_default().search(params)
@@ -1,4 +1,6 @@
 # flake8: noqa
 
+from wallhaven.api.async_wallhaven import AsyncWallhaven
 from wallhaven.api.endpoints import API_ENDPOINTS
+from wallhaven.api.paginator import Paginator
 from wallhaven.api.wallhaven import Wallhaven
@@ -0,0 +1,459 @@
+"""Provides AsyncWallhaven to interact with the Wallhaven API asynchronously."""
+import asyncio
+import contextlib
+import os
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from wallhaven.api.endpoints import URLs
+from wallhaven.exceptions import ApiKeyError, TooManyRequestsError
+from wallhaven.models import (
+    BaseListing,
+    Collection,
+    CollectionListing,
+    SearchResults,
+    Tag,
+    UserSettings,
+    Wallpaper,
+)
+from wallhaven.ratelimit import async_limiter, backoff, parse_retry_after
+from wallhaven.serialization import loads
+from wallhaven.session import CHUNK_SIZE, DEFAULT_CONCURRENCY
+
+L = TypeVar("L", bound=BaseListing)
+
+
+class AsyncWallhaven:
+    """An asynchronous wrapper around the Wallhaven API.
+
+    `AsyncWallhaven` mirrors the methods of `Wallhaven`, but every method is a
+    coroutine. This allows users to run several requests at once, e.g. with
+    `asyncio.gather`, instead of waiting for each response before sending the next
+    request.
+
+    Basic Usage:
+        >>> async with AsyncWallhaven() as wallhaven:
+        ...     wallpaper = await wallhaven.get_wallpaper(wallpaper_id="8oxreo")
+        <Wallpaper(id='8oxreo', ...)>
+    """
+
+    __slots__ = (
+        "api_key",
+        "params",
+        "timeout",
+        "retries",
+        "concurrency",
+        "_limiter",
+        "_client",
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: Optional[int] = 30,
+        retries: int = 3,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+    ) -> None:
+        """Initialize an AsyncWallhaven instance.
+
+        Args:
+            api_key (str): A key that grants users unrestricted access to the API.
+                If no API key is given, `AsyncWallhaven` will try to load one from the
+                `WALLHAVEN_API_KEY` environment variable.
+            timeout (int | None): The limit of time (in seconds) that `AsyncWallhaven`
+                will wait for the server's response. The value of `None` means that
+                `AsyncWallhaven` will wait forever.
+            retries (int): How many times a request is retried after the API responds
+                with `429 - Too many requests`.
+            concurrency (int): How many requests the bulk methods, such as
+                `get_wallpapers`, send at the same time by default.
+            max_connections (int): The maximum number of connections that may be open
+                at the same time.
+            max_keepalive_connections (int): The maximum number of idle connections
+                kept alive to be reused by later requests.
+        """
+        self.api_key = api_key or os.getenv("WALLHAVEN_API_KEY")
+
+        # The parameters used when searching for wallpapers.
+        # For more information, see `https://wallhaven.cc/help/api#search`.
+        self.params: Dict[str, Any] = {}
+        self.timeout = timeout
+        self.retries = retries
+        self.concurrency = concurrency
+
+        # Concurrent requests wait for the global limiter, which is shared by every
+        # instance, so that they stay within the limit of 45 API calls per minute.
+        self._limiter = async_limiter
+
+        # Unlike `Wallhaven`, each `AsyncWallhaven` owns its client. This means we can
+        # set the `X-API-Key` header once instead of passing it with every request.
+        headers: Dict[str, str] = {}
+        if self.api_key is not None:
+            headers["X-API-Key"] = self.api_key
+
+        # Requests sent concurrently through the same client are multiplexed over a
+        # single HTTP/2 connection whenever the server supports it.
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            event_hooks={"response": [self._check_for_errors]},
+        )
+
+    async def __aenter__(self) -> "AsyncWallhaven":
+        """Return the instance, which is closed once the block is exited."""
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Close the instance. See `AsyncWallhaven.close`."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying client and release its connections."""
+        await self._client.aclose()
+
+    @staticmethod
+    async def _check_for_errors(response: httpx.Response) -> None:
+        """Check for HTTP errors in a `Response` object."""
+        if response.status_code == 401:
+            raise ApiKeyError(
+                "The API key is invalid. Please check if everything is correct or "
+                + "regenerate your API key."
+            )
+        elif response.status_code == 429:
+            raise TooManyRequestsError(
+                "You've exceeded the limit of 45 API calls per minute. Please try "
+                + "again later!",
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        response.raise_for_status()
+
+    async def _get(self, url: str, **kwargs) -> Dict[str, Any]:
+        """Send a GET request and parse it as json.
+
+        Args:
+            url (str): The endpoint to request.
+            **kwargs: Optional keyword arguments that `httpx.AsyncClient.get` takes.
+
+        Returns:
+            The json-encoded content of the response.
+
+        Raises:
+            TooManyRequestsError: If the API still responds with `429 - Too many
+                requests` after all retries.
+        """
+        # Bind the methods once instead of looking them up on every attempt.
+        acquire = self._limiter.acquire
+        client_get = self._client.get
+
+        attempt = 0
+        while True:
+            await acquire()
+            try:
+                response = await client_get(url, **kwargs)
+            except TooManyRequestsError as error:
+                if attempt >= self.retries:
+                    raise
+
+                # Back off exponentially, but never wait less than the server asked
+                # us to.
+                await asyncio.sleep(max(backoff(attempt), error.retry_after or 0))
+                attempt += 1
+            else:
+                return loads(response.content)
+
+    async def _fetch_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[L]],
+        max_pages: Optional[int],
+        concurrency: Optional[int],
+    ) -> L:
+        """Fetch several pages of a listing at once and merge them into a single one.
+
+        See `Wallhaven._fetch_pages`. The remaining pages are requested concurrently,
+        at most `concurrency` at the same time.
+        """
+        first = await fetch_page(1)
+        last_page = first.meta.last_page
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def fetch(page: int) -> L:
+            async with semaphore:
+                return await fetch_page(page)
+
+        wallpapers = list(first.data)
+        pages = range(2, last_page + 1)
+        for listing in await asyncio.gather(*(fetch(page) for page in pages)):
+            wallpapers.extend(listing.data)
+        return type(first)(data=wallpapers, meta=first.meta)
+
+    async def get_wallpaper(self, wallpaper_id: str) -> Wallpaper:
+        """Get wallpaper from a given ID. An API key is required for NSFW wallpapers.
+
+        Args:
+            wallpaper_id (str): The wallpaper ID, e.g "8oxreo".
+
+        Returns:
+            An instance of a `Wallpaper` object.
+        """
+        url = URLs.WALLPAPER % wallpaper_id
+        response = await self._get(url)
+        return Wallpaper.from_dict(response["data"])
+
+    async def get_wallpapers(
+        self, wallpaper_ids: List[str], concurrency: Optional[int] = None
+    ) -> List[Wallpaper]:
+        """Get several wallpapers at once.
+
+        The requests are sent concurrently and the wallpapers are returned in the same
+        order as `wallpaper_ids`.
+
+        Args:
+            wallpaper_ids (list): A list of wallpaper IDs, e.g ["8oxreo", "x8ye3z"].
+            concurrency (int | None): The maximum number of requests sent at the same
+                time. Defaults to `self.concurrency`.
+
+        Returns:
+            A list of `Wallpaper` objects.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def get_wallpaper(wallpaper_id: str) -> Wallpaper:
+            async with semaphore:
+                return await self.get_wallpaper(wallpaper_id)
+
+        return list(await asyncio.gather(*(get_wallpaper(i) for i in wallpaper_ids)))
+
+    async def save_wallpapers(
+        self,
+        wallpapers: Iterable[Wallpaper],
+        path: Union[Path, str],
+        override: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """Download several wallpapers at once and save them in `path`.
+
+        The files are named and existing files are skipped the same way as with
+        `Wallpaper.save`. At most `concurrency` wallpapers are downloaded at the same
+        time, all of them through the same connection pool.
+
+        Args:
+            wallpapers (Iterable[Wallpaper]): The wallpapers to download, e.g. the
+                `data` of a `SearchResults` object.
+            path (Path | str): The directory where the wallpapers will be saved.
+            override (bool): Whether to override existing files.
+            concurrency (int | None): The maximum number of simultaneous downloads.
+                Defaults to `self.concurrency`.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        # File operations block, so they run in the default executor instead of the
+        # event loop.
+        loop = asyncio.get_running_loop()
+
+        # Wallpapers are served by a different host than the API, so they are
+        # downloaded without the `X-API-Key` header and without counting towards the
+        # API rate limit.
+        async with httpx.AsyncClient(timeout=self.timeout, http2=True) as client:
+
+            async def save(wallpaper: Wallpaper) -> None:
+                filepath = path.joinpath(
+                    f"wallhaven-{wallpaper.id}{wallpaper.extension}"
+                )
+                async with semaphore:
+                    if filepath.exists() and not override:
+                        return
+
+                    # The wallpaper is written to a temporary file, which only
+                    # replaces `filepath` once it's complete. A failed or cancelled
+                    # download never leaves a truncated wallpaper behind.
+                    partial = filepath.with_name(filepath.name + ".part")
+                    img_file = await loop.run_in_executor(None, open, partial, "wb")
+                    try:
+                        async with client.stream("GET", wallpaper.path) as response:
+                            response.raise_for_status()
+                            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                                await loop.run_in_executor(None, img_file.write, chunk)
+                        await loop.run_in_executor(None, img_file.close)
+                        await loop.run_in_executor(None, partial.replace, filepath)
+                    except BaseException:
+                        img_file.close()
+                        with contextlib.suppress(OSError):
+                            partial.unlink()
+                        raise
+
+            await asyncio.gather(*(save(w) for w in wallpapers))
+
+    async def get_tag(self, tag_id: Union[str, int]) -> Tag:
+        """Get tag from a given ID.
+
+        Args:
+            tag_id (str | int): An integer or a numeric string representing the Tag id.
+
+        Returns:
+            An instance of a `Tag` object.
+        """
+        url = URLs.TAG % tag_id
+        response = await self._get(url)
+        return Tag.from_dict(response["data"])
+
+    async def get_user_settings(self) -> UserSettings:
+        """Read an authenticated user's settings from the API key.
+
+        Returns:
+            An instance of a `UserSettings` object.
+
+        Raises:
+            ApiKeyError: For an invalid API key or when one is not provided.
+        """
+        if self.api_key is None:
+            raise ApiKeyError("An API key is required to read an user's settings.")
+
+        response = await self._get(URLs.SETTINGS)
+        return UserSettings.from_dict(response["data"])
+
+    async def get_collections(self, username: str) -> List[Collection]:
+        """Get the public collections of a given user.
+
+        Args:
+            username (str): The collections' owner.
+
+        Returns:
+            A list of `Collection` objects or an empty list if no collections are found.
+        """
+        url = URLs.COLLECTIONS % username
+        response = await self._get(url)
+        return list(map(Collection.from_dict, response.get("data") or []))
+
+    async def get_all_collections(self) -> List[Collection]:
+        """Get all collections (including private ones) from an authenticated user.
+
+        Returns:
+            A list of `Collection` objects.
+
+        Raises:
+            ApiKeyError: For an invalid API key or when one is not provided.
+        """
+        if self.api_key is None:
+            raise ApiKeyError(
+                "An API key is required to get collections from an authenticated user."
+            )
+        response = await self._get(URLs.COLLECTIONS_APIKEY)
+        return list(map(Collection.from_dict, response.get("data") or []))
+
+    async def _get_collection_listing(
+        self, username: str, collection_id: int, page: int = 1
+    ) -> CollectionListing:
+        """Get a page of the listing of wallpapers in a collection."""
+        url = URLs.COLLECTION_LISTING % (username, collection_id)
+        params = {"page": page} if page > 1 else None
+        response = await self._get(url, params=params)
+        response["meta"]["request_url"] = url
+        return CollectionListing.from_dict(response)
+
+    async def get_collection_listing(
+        self, username: str, collection_id: int
+    ) -> CollectionListing:
+        """Get the listing of wallpapers from a collection.
+
+        Private collections can only be listed if an API key is provided.
+
+        Args:
+            username (str): A string representing the collection's owner.
+            collection_id (int): An integer representing the collection's ID.
+
+        Returns:
+            A `CollectionListing` object that provides a list of wallpapers and meta
+            information that can be used as pagination.
+        """
+        return await self._get_collection_listing(username, collection_id)
+
+    async def get_full_collection_listing(
+        self, username: str, collection_id: int, concurrency: Optional[int] = None
+    ) -> CollectionListing:
+        """Get the wallpapers from every page of a collection listing at once.
+
+        After the first page, the remaining pages are requested concurrently. Private
+        collections can also be listed, as long as an API key is provided.
+
+        Args:
+            username (str): A string representing the collection's owner.
+            collection_id (int): An integer representing the collection's ID.
+            concurrency (int | None): The maximum number of requests sent at the same
+                time. Defaults to `self.concurrency`.
+
+        Returns:
+            A `CollectionListing` with the wallpapers of every page and the `meta` of
+            the first page.
+        """
+        return await self._fetch_pages(
+            lambda page: self._get_collection_listing(username, collection_id, page),
+            max_pages=None,
+            concurrency=concurrency,
+        )
+
+    async def _search(self, params: Dict[str, Any]) -> SearchResults:
+        """Perform a search with the given parameters."""
+        data = await self._get(URLs.SEARCH, params=params)
+        return SearchResults.from_dict(data)
+
+    async def search(self, params: Optional[Dict[str, Any]] = None) -> SearchResults:
+        """Perform a search using `params`, or `self.params` if they are not given.
+
+        See `Wallhaven.search` for details about how the parameters are merged with
+        the user's browsing settings.
+        """
+        return await self._search(self.params if params is None else params)
+
+    async def search_pages(
+        self, max_pages: int, concurrency: Optional[int] = None
+    ) -> SearchResults:
+        """Get the results from the first `max_pages` pages of a search at once.
+
+        After the first page, the remaining pages are requested concurrently. See
+        `Wallhaven.search_pages` for more information.
+
+        Args:
+            max_pages (int): The maximum number of pages to fetch.
+            concurrency (int | None): The maximum number of requests sent at the same
+                time. Defaults to `self.concurrency`.
+
+        Returns:
+            `SearchResults` with the wallpapers of every page and the `meta` of the
+            first page.
+        """
+        params = dict(self.params)
+
+        async def fetch_page(page: int) -> SearchResults:
+            results = await self._search({**params, "page": page})
+
+            # The first page is always requested on its own, so its seed (when sorting
+            # by `random`) is set before the other pages are requested.
+            if results.meta.seed is not None:
+                params.setdefault("seed", results.meta.seed)
+            return results
+
+        return await self._fetch_pages(fetch_page, max_pages, concurrency)
@@ -3,13 +3,40 @@
 For more information, see: https://wallhaven.cc/help/api
 """
 
+from types import MappingProxyType
+
+BASE_URL = "https://wallhaven.cc/api/v1"
+
+# The mapping is read-only, so the endpoints can't be modified by accident.
 # fmt: off
-API_ENDPOINTS = {
-    "wallpaper":            "https://wallhaven.cc/api/v1/w/{id}",
-    "tag":                  "https://wallhaven.cc/api/v1/tag/{id}",
-    "settings":             "https://wallhaven.cc/api/v1/settings",
-    "collection":           "https://wallhaven.cc/api/v1/collections/{username}",
-    "collection_apikey":    "https://wallhaven.cc/api/v1/collections",
-    "collection_listing":   "https://wallhaven.cc/api/v1/collections/{username}/{id}",
-    "search":               "https://wallhaven.cc/api/v1/search"
-}
+API_ENDPOINTS = MappingProxyType({
+    "wallpaper":            BASE_URL + "/w/{id}",
+    "tag":                  BASE_URL + "/tag/{id}",
+    "settings":             BASE_URL + "/settings",
+    "collection":           BASE_URL + "/collections/{username}",
+    "collection_apikey":    BASE_URL + "/collections",
+    "collection_listing":   BASE_URL + "/collections/{username}/{id}",
+    "search":               BASE_URL + "/search"
+})
+# fmt: on
+
+
+class URLs:
+    """The same endpoints as `API_ENDPOINTS`, ready to be used with `%`.
+
+    These are used internally when requesting the API, since formatting a string with
+    `%` is cheaper than looking up the dictionary and calling `str.format` every time.
+
+    Usage:
+
+    >>> URLs.WALLPAPER % "8oxreo"
+    'https://wallhaven.cc/api/v1/w/8oxreo'
+    """
+
+    WALLPAPER = BASE_URL + "/w/%s"
+    TAG = BASE_URL + "/tag/%s"
+    SETTINGS = BASE_URL + "/settings"
+    COLLECTIONS = BASE_URL + "/collections/%s"
+    COLLECTIONS_APIKEY = BASE_URL + "/collections"
+    COLLECTION_LISTING = BASE_URL + "/collections/%s/%s"
+    SEARCH = BASE_URL + "/search"
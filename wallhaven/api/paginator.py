@@ -0,0 +1,76 @@
+"""Provides Paginator to iterate over the pages of a listing."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generic, Optional, TypeVar
+
+from wallhaven.models import BaseListing
+
+L = TypeVar("L", bound=BaseListing)
+
+
+class Paginator(Generic[L]):
+    """An iterator over the pages of a collection listing or a search.
+
+    While the current page is being used, the next one is already being requested in
+    the background, so that it's ready (or almost ready) once it's needed.
+
+    Usage:
+
+    >>> for results in wallhaven.paginate_search():
+    ...     for wallpaper in results.data:
+    ...         wallpaper.save(path)
+    """
+
+    def __init__(
+        self, fetch_page: Callable[[int], L], start: int = 1, prefetch: bool = True
+    ) -> None:
+        """Initialize a Paginator.
+
+        Args:
+            fetch_page (Callable): A function that requests a page given its number.
+            start (int): The number of the first page.
+            prefetch (bool): Whether to request the next page in the background.
+        """
+        self.prefetch = prefetch
+        self._fetch_page = fetch_page
+        self._page: Optional[int] = start
+        self._pending: Optional[Future] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __iter__(self) -> "Paginator[L]":
+        """Return the paginator itself, since it's an iterator."""
+        return self
+
+    def __next__(self) -> L:
+        """Return the next page, or raise `StopIteration` after the last one."""
+        if self._page is None:
+            raise StopIteration
+
+        if self._pending is not None:
+            # Forget the request before waiting for it, so that a failed request is
+            # sent again by the next call instead of raising the same error forever.
+            pending, self._pending = self._pending, None
+            listing = pending.result()
+        else:
+            listing = self._fetch_page(self._page)
+
+        if self._page >= listing.meta.last_page:
+            self.close()
+        else:
+            self._page += 1
+            if self.prefetch:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1)
+                self._pending = self._executor.submit(self._fetch_page, self._page)
+
+        return listing
+
+    def close(self) -> None:
+        """Stop the iteration and discard the page being requested, if any."""
+        self._page = None
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -1,10 +1,24 @@
 """Provides Wallhaven to interact with the Wallhaven API."""
 import os
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    TypeVar,
+    Union,
+)
 
-from wallhaven.api import API_ENDPOINTS
+from wallhaven.api.endpoints import URLs
+from wallhaven.api.paginator import Paginator
+from wallhaven.cache import LONG_TTL, SHORT_TTL, TTLCache
 from wallhaven.exceptions import ApiKeyError
 from wallhaven.models import (
+    BaseListing,
     Collection,
     CollectionListing,
     SearchResults,
@@ -12,7 +26,11 @@ from wallhaven.models import (
     UserSettings,
     Wallpaper,
 )
-from wallhaven.session import handler
+from wallhaven.ratelimit import limiter
+from wallhaven.session import DEFAULT_CONCURRENCY, RequestHandler
+
+T = TypeVar("T")
+L = TypeVar("L", bound=BaseListing)
 
 
 class Wallhaven:
@@ -22,10 +40,21 @@ class Wallhaven:
         >>> wallhaven = Wallhaven()
         >>> wallpaper = wallhaven.get_wallpaper(wallpaper_id="8oxreo")
         <Wallpaper(id='8oxreo', ...)>
+
+    The connections are kept alive until `close` is called, or until the end of a
+    `with` block:
+        >>> with Wallhaven() as wallhaven:
+        ...     wallpaper = wallhaven.get_wallpaper(wallpaper_id="8oxreo")
     """
 
+    __slots__ = ("api_key", "params", "timeout", "concurrency", "cache", "handler")
+
     def __init__(
-        self, api_key: Optional[str] = None, timeout: Optional[int] = 30
+        self,
+        api_key: Optional[str] = None,
+        timeout: Optional[int] = 30,
+        cache: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
     ) -> None:
         """Initialize a Wallhaven instance.
 
@@ -37,6 +66,10 @@ class Wallhaven:
             timeout (int | None): The limit of time (in seconds) that `Wallhaven` will
                 wait for the server's response. The value of `None` means that
                 `Wallhaven` will wait forever.
+            cache (bool): Whether to cache the responses in memory. If set to False,
+                every call requests the API again.
+            concurrency (int): How many requests the bulk methods, such as
+                `get_wallpapers`, send at the same time by default, and at most.
         """
         self.api_key = api_key or os.getenv("WALLHAVEN_API_KEY")
 
@@ -44,18 +77,57 @@ class Wallhaven:
         # For more information, see `https://wallhaven.cc/help/api#search`.
         self.params: Dict[str, Any] = {}
 
-        # The timeout cannot be passed to the global `handler`. Since it will be shared
-        # by the CLI as well, we can't risk the API modifying a configuration the user
-        # set for the CLI. By passing the timeout when we call `handler.get`, it will
-        # only be used in that request.
+        # Each instance owns its handler instead of using the global one shared with
+        # the CLI. This way, the connections are reused across every request made by
+        # this instance, and we can't risk modifying a configuration the user set for
+        # the CLI.
         self.timeout = timeout
+        self.concurrency = concurrency
+
+        # Responses are cached in memory, so requesting the same wallpaper or tag
+        # twice only hits the network once. Call `self.cache.clear()` to start over.
+        # Expired entries are kept around, so they can still be used if the API can't
+        # be reached.
+        self.cache: Optional[TTLCache] = TTLCache() if cache else None
+
+        # Requests wait for the global limiter, which is shared by every instance, so
+        # that they stay within the limit of 45 API calls per minute. The pool keeps
+        # one connection for each concurrent request, plus room for the paginator's
+        # prefetch and the cache's background refresh.
+        self.handler = RequestHandler(
+            timeout=timeout,
+            pool_maxsize=concurrency + 2,
+            cache=self.cache,
+            limiter=limiter,
+        )
 
         # Users can authenticate by including their API key either in a request URL by
         # appending ?apikey=<API KEY>, or by including the X-API-Key: <API KEY> header
-        # with the request. We will use the latter.
-        self.headers: Dict[str, str] = {}
+        # with the request. We will use the latter. Since the session belongs to this
+        # instance, the header only needs to be set once.
         if self.api_key is not None:
-            self.headers["X-API-Key"] = self.api_key
+            self.handler.session.headers["X-API-Key"] = self.api_key
+
+    def __enter__(self) -> "Wallhaven":
+        """Return the instance, which is closed once the block is exited."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the instance. See `Wallhaven.close`."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying session and release its connections."""
+        self.handler.close()
+
+    @property
+    def headers(self) -> MutableMapping[str, Union[str, bytes]]:
+        """The headers sent with every request, including the `X-API-Key` header.
+
+        These are the headers of the underlying session, so changing them affects
+        the next requests.
+        """
+        return self.handler.session.headers
 
     @staticmethod
     def _get_collections_from_response(response: Dict[str, list]) -> List[Collection]:
@@ -78,13 +150,67 @@ class Wallhaven:
         # an empty list when fetching collections from a given username. This is not the
         # case when fetching collections using the API key, since the response will have
         # at least one collection.
-        collections: list = response["data"]
-        if collections:
-            collections = [Collection.from_dict(c) for c in collections]
-        return collections
+        return list(map(Collection.from_dict, response.get("data") or []))
+
+    def _map(
+        self, func: Callable[..., T], *iterables: Iterable, max_workers: Optional[int]
+    ) -> List[T]:
+        """Call `func` for each item in `iterables` using a pool of threads.
+
+        This is a helper method for fetching several objects at once. Since every call
+        goes through the same handler, the threads share its connections and the rate
+        limiter. The results are returned in the same order as the items.
+
+        Args:
+            func (Callable): The function that will be called for each item.
+            *iterables (Iterable): The arguments passed to `func`, as in `map`.
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            A list with the results of each call.
+        """
+        # The connection pool is sized from `self.concurrency`, so more workers would
+        # open connections that the pool can't keep and has to discard.
+        max_workers = min(max_workers or self.concurrency, self.concurrency)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, *iterables))
+
+    def _fetch_pages(
+        self,
+        fetch_page: Callable[[int], L],
+        max_pages: Optional[int],
+        max_workers: Optional[int],
+    ) -> L:
+        """Fetch several pages of a listing at once and merge them into a single one.
+
+        The first page is requested on its own, since its `meta` tells how many pages
+        there are. The remaining pages are then requested concurrently.
+
+        Args:
+            fetch_page (Callable): A function that requests a page given its number.
+            max_pages (int | None): The maximum number of pages to fetch. The value of
+                `None` means that every page is fetched.
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            A listing with the wallpapers of every page, in order, and the `meta` of the
+            first page.
+        """
+        first = fetch_page(1)
+        last_page = first.meta.last_page
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+
+        wallpapers = list(first.data)
+        pages = range(2, last_page + 1)
+        for listing in self._map(fetch_page, pages, max_workers=max_workers):
+            wallpapers.extend(listing.data)
+        return type(first)(data=wallpapers, meta=first.meta)
 
     def _get_collection_listing(
-        self, username: str, collection_id: int, private: bool = False
+        self, username: str, collection_id: int, page: int = 1
     ) -> CollectionListing:
         """Get the listing of wallpapers in a collection.
 
@@ -95,21 +221,16 @@ class Wallhaven:
         Args:
             username (str): A string representing the collection's owner.
             collection_id (int): An integer representing the collection's ID.
-            private (bool): Whether the collection is private (True) or public (False).
+            page (int): The page of the listing.
 
         Returns:
             A `CollectionListing` object that provides a list of wallpapers and meta
             information that can be used as pagination.
         """
         # Same endpoint for both public and private collection listing.
-        url = API_ENDPOINTS["collection_listing"].format(
-            username=username, id=collection_id
-        )
-
-        if private:
-            response = handler.get_json(url, timeout=self.timeout, headers=self.headers)
-        else:
-            response = handler.get_json(url, timeout=self.timeout)
+        url = URLs.COLLECTION_LISTING % (username, collection_id)
+        params = {"page": page} if page > 1 else None
+        response = self.handler.get_json(url, ttl=SHORT_TTL, params=params)
 
         # Add the request URL to the meta dict.
         # This URL will be later used for pagination, as we only need to append
@@ -129,10 +250,25 @@ class Wallhaven:
         Returns:
             An instance of a `Wallpaper` object.
         """
-        url = API_ENDPOINTS["wallpaper"].format(id=wallpaper_id)
-        response = handler.get_json(url, timeout=self.timeout, headers=self.headers)
+        url = URLs.WALLPAPER % wallpaper_id
+        response = self.handler.get_json(url, ttl=LONG_TTL)
         return Wallpaper.from_dict(response["data"])
 
+    def get_wallpapers(
+        self, wallpaper_ids: Iterable[str], max_workers: Optional[int] = None
+    ) -> List[Wallpaper]:
+        """Get several wallpapers at once.
+
+        Args:
+            wallpaper_ids (Iterable): The wallpaper IDs, e.g ["8oxreo", "x8ye3z"].
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            A list of `Wallpaper` objects in the same order as `wallpaper_ids`.
+        """
+        return self._map(self.get_wallpaper, wallpaper_ids, max_workers=max_workers)
+
     def get_tag(self, tag_id: Union[str, int]) -> Tag:
         """Get tag from a given ID.
 
@@ -142,10 +278,25 @@ class Wallhaven:
         Returns:
             An instance of a `Tag` object.
         """
-        url = API_ENDPOINTS["tag"].format(id=tag_id)
-        response = handler.get_json(url, timeout=self.timeout)
+        url = URLs.TAG % tag_id
+        response = self.handler.get_json(url, ttl=LONG_TTL)
         return Tag.from_dict(response["data"])
 
+    def get_tags(
+        self, tag_ids: Iterable[Union[str, int]], max_workers: Optional[int] = None
+    ) -> List[Tag]:
+        """Get several tags at once.
+
+        Args:
+            tag_ids (Iterable): The tag IDs, e.g [1, 2, 3].
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            A list of `Tag` objects in the same order as `tag_ids`.
+        """
+        return self._map(self.get_tag, tag_ids, max_workers=max_workers)
+
     def get_user_settings(self) -> UserSettings:
         """Read an authenticated user's settings from the API key.
 
@@ -158,8 +309,10 @@ class Wallhaven:
         if self.api_key is None:
             raise ApiKeyError("An API key is required to read an user's settings.")
 
-        url = API_ENDPOINTS["settings"]
-        response = handler.get_json(url, timeout=self.timeout, headers=self.headers)
+        # The settings can be changed by the user at anytime, so they are only cached
+        # for a short while.
+        url = URLs.SETTINGS
+        response = self.handler.get_json(url, ttl=SHORT_TTL)
         return UserSettings.from_dict(response["data"])
 
     def get_collections(self, username: str) -> List[Collection]:
@@ -178,8 +331,8 @@ class Wallhaven:
             private. In this case, use `get_all_collections` with an API key.
 
         """
-        url = API_ENDPOINTS["collection"].format(username=username)
-        response = handler.get_json(url, timeout=self.timeout)
+        url = URLs.COLLECTIONS % username
+        response = self.handler.get_json(url, ttl=SHORT_TTL)
         return self._get_collections_from_response(response)
 
     def get_all_collections(self) -> List[Collection]:
@@ -198,8 +351,8 @@ class Wallhaven:
             raise ApiKeyError(
                 "An API key is required to get collections from an authenticated user."
             )
-        url = API_ENDPOINTS["collection_apikey"]
-        response = handler.get_json(url, timeout=self.timeout, headers=self.headers)
+        url = URLs.COLLECTIONS_APIKEY
+        response = self.handler.get_json(url, ttl=SHORT_TTL)
         return self._get_collections_from_response(response)
 
     def get_collection_listing(
@@ -217,6 +370,32 @@ class Wallhaven:
         """
         return self._get_collection_listing(username, collection_id)
 
+    def get_collection_listings(
+        self,
+        username: str,
+        collection_ids: Iterable[int],
+        max_workers: Optional[int] = None,
+    ) -> List[CollectionListing]:
+        """Get the listing of wallpapers from several public collections at once.
+
+        Args:
+            username (str): A string representing the collections' owner.
+            collection_ids (Iterable): The collections' IDs.
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            A list of `CollectionListing` objects in the same order as
+            `collection_ids`.
+        """
+        collection_ids = list(collection_ids)
+        return self._map(
+            self.get_collection_listing,
+            [username] * len(collection_ids),
+            collection_ids,
+            max_workers=max_workers,
+        )
+
     def get_private_collection_listing(
         self, username: str, collection_id: int
     ) -> CollectionListing:
@@ -241,9 +420,61 @@ class Wallhaven:
                 + "private collection."
             )
 
-        return self._get_collection_listing(username, collection_id, private=True)
+        return self._get_collection_listing(username, collection_id)
+
+    def paginate_collection_listing(
+        self, username: str, collection_id: int, start: int = 1, prefetch: bool = True
+    ) -> Paginator[CollectionListing]:
+        """Iterate over the pages of a collection listing.
+
+        Private collections can also be listed, as long as an API key is provided.
+
+        Args:
+            username (str): A string representing the collection's owner.
+            collection_id (int): An integer representing the collection's ID.
+            start (int): The number of the first page.
+            prefetch (bool): Whether to request the next page in the background.
+
+        Returns:
+            A `Paginator` that yields a `CollectionListing` for each page.
+        """
+        return Paginator(
+            lambda page: self._get_collection_listing(username, collection_id, page),
+            start=start,
+            prefetch=prefetch,
+        )
+
+    def get_full_collection_listing(
+        self, username: str, collection_id: int, max_workers: Optional[int] = None
+    ) -> CollectionListing:
+        """Get the wallpapers from every page of a collection listing at once.
+
+        After the first page, the remaining pages are requested concurrently. Private
+        collections can also be listed, as long as an API key is provided.
+
+        Args:
+            username (str): A string representing the collection's owner.
+            collection_id (int): An integer representing the collection's ID.
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            A `CollectionListing` with the wallpapers of every page and the `meta` of
+            the first page.
+        """
+        return self._fetch_pages(
+            lambda page: self._get_collection_listing(username, collection_id, page),
+            max_pages=None,
+            max_workers=max_workers,
+        )
+
+    def _search(self, params: Dict[str, Any]) -> SearchResults:
+        """Perform a search with the given parameters."""
+        # If `params` is empty, the search will use the default parameters.
+        data = self.handler.get_json(URLs.SEARCH, ttl=SHORT_TTL, params=params)
+        return SearchResults.from_dict(data)
 
-    def search(self) -> SearchResults:
+    def search(self, params: Optional[Dict[str, Any]] = None) -> SearchResults:
         """Perform a search.
 
         If you provide an API key with no extra parameters, search will be performed
@@ -261,11 +492,69 @@ class Wallhaven:
         Also, the only way to retrieve more than 24 results per page is to change the
         `Thumbs Per Page` option in your browsing settings and providing an API key
         whenever performing a search.
+
+        Args:
+            params (dict | None): The search parameters. If not given, `self.params`
+                is used.
         """
-        url = API_ENDPOINTS["search"]
+        return self._search(self.params if params is None else params)
 
-        # If `self.params` is empty, the search will use the default parameters.
-        data = handler.get_json(
-            url, timeout=self.timeout, headers=self.headers, params=self.params
-        )
-        return SearchResults.from_dict(data)
+    def paginate_search(
+        self, start: int = 1, prefetch: bool = True
+    ) -> Paginator[SearchResults]:
+        """Iterate over the pages of a search.
+
+        The search is performed with a copy of `self.params`, so changing them while
+        iterating doesn't affect the pages that are left. See `search` for more
+        information about how the parameters are used.
+
+        Args:
+            start (int): The number of the first page.
+            prefetch (bool): Whether to request the next page in the background.
+
+        Returns:
+            A `Paginator` that yields `SearchResults` for each page.
+        """
+        params = dict(self.params)
+
+        def fetch_page(page: int) -> SearchResults:
+            results = self._search({**params, "page": page})
+
+            # When sorting by `random`, the seed must be passed between pages to make
+            # sure there are no repeats.
+            if results.meta.seed is not None:
+                params.setdefault("seed", results.meta.seed)
+            return results
+
+        return Paginator(fetch_page, start=start, prefetch=prefetch)
+
+    def search_pages(
+        self, max_pages: int, max_workers: Optional[int] = None
+    ) -> SearchResults:
+        """Get the results from the first `max_pages` pages of a search at once.
+
+        After the first page, the remaining pages are requested concurrently. Searches
+        can have thousands of pages, which is why the number of pages must be given.
+        See `search` for more information about how the parameters are used.
+
+        Args:
+            max_pages (int): The maximum number of pages to fetch.
+            max_workers (int | None): The maximum amount of requests sent at the same
+                time. Defaults to, and can't be more than, `self.concurrency`.
+
+        Returns:
+            `SearchResults` with the wallpapers of every page and the `meta` of the
+            first page.
+        """
+        params = dict(self.params)
+
+        def fetch_page(page: int) -> SearchResults:
+            results = self._search({**params, "page": page})
+
+            # The first page is always requested on its own, so its seed (when sorting
+            # by `random`) is set before the other pages are requested.
+            if results.meta.seed is not None:
+                params.setdefault("seed", results.meta.seed)
+            return results
+
+        return self._fetch_pages(fetch_page, max_pages, max_workers)
@@ -0,0 +1,126 @@
+"""Provides TTLCache to store API responses in memory."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+# Wallpapers and tags practically never change once they are created, while listings
+# such as collections and search results change every time a wallpaper is added.
+LONG_TTL = 24 * 60 * 60
+SHORT_TTL = 60
+
+
+class CacheEntry(NamedTuple):
+    """Represents a cached response.
+
+    Attributes:
+        content (bytes): The body of the response.
+        fetched_at (float): When the response was received, as given by
+            `time.monotonic()`.
+        ttl (float): For how long (in seconds) the entry is valid.
+        etag (str | None): The `ETag` header of the response, if any. It is used to
+            revalidate the entry once it expires.
+    """
+
+    content: bytes
+    fetched_at: float
+    ttl: float
+    etag: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """How long ago (in seconds) the response was received."""
+        return time.monotonic() - self.fetched_at
+
+    def is_expired(self) -> bool:
+        """Whether the entry is too old to be used."""
+        return self.age > self.ttl
+
+    def is_stale(self) -> bool:
+        """Whether the entry is past half its lifetime and should be refreshed.
+
+        Stale entries are still valid, but they should be refreshed in the background
+        so that the next request doesn't need to wait for the network.
+        """
+        return self.age > self.ttl / 2
+
+
+class TTLCache:
+    """A thread-safe cache whose entries expire after some time.
+
+    The cache holds at most `maxsize` entries. Once it is full, the least recently used
+    entry is discarded to make room for a new one.
+
+    Usage:
+
+    >>> cache = TTLCache(maxsize=2, ttl=60)
+    >>> cache.set("key", b"content")
+    >>> cache.get("key")
+    CacheEntry(content=b'content', fetched_at=..., ttl=60, etag=None)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600) -> None:
+        """Initialize a TTLCache.
+
+        Args:
+            maxsize (int): The maximum number of entries kept in the cache.
+            ttl (float): The default lifetime (in seconds) of an entry.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of entries, including the expired ones."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, include_expired: bool = False) -> Optional[CacheEntry]:
+        """Return the entry stored under `key`.
+
+        Expired entries are kept until they are replaced or discarded to make room, so
+        they can still be revalidated with the server.
+
+        Args:
+            key: Any hashable object that identifies the response.
+            include_expired (bool): Whether to return the entry even if it's expired.
+
+        Returns:
+            The entry or None if it is missing (or expired).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry.is_expired() and not include_expired):
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: Hashable,
+        content: bytes,
+        ttl: Optional[float] = None,
+        etag: Optional[str] = None,
+    ) -> None:
+        """Store `content` under `key`.
+
+        Args:
+            key: Any hashable object that identifies the response.
+            content (bytes): The body of the response.
+            ttl (float | None): For how long (in seconds) the entry is valid. If not
+                given, the cache's default `ttl` is used.
+            etag (str | None): The `ETag` header of the response, if any.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        entry = CacheEntry(content, time.monotonic(), ttl, etag)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
@@ -1,6 +1,19 @@
-class ApiKeyError(Exception):
+from typing import Optional
+
+
+class WallhavenError(Exception):
+    """Base class for the errors raised by `wallhaven`."""
+
     pass
 
 
-class TooManyRequestsError(Exception):
+class ApiKeyError(WallhavenError):
     pass
+
+
+class TooManyRequestsError(WallhavenError):
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        """Initialize a TooManyRequestsError with the `Retry-After` of the response."""
+        super().__init__(message)
+        # How long (in seconds) the server asked us to wait before retrying, if known.
+        self.retry_after = retry_after
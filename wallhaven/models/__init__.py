@@ -1,6 +1,7 @@
 # flake8: noqa
 
 from wallhaven.models.api import (
+    BaseListing,
     Collection,
     CollectionListing,
     SearchResults,
@@ -1,31 +1,138 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError, asdict, dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from typing_extensions import Literal
 
-from wallhaven.session import handler
+from wallhaven.serialization import dumps
+from wallhaven.session import DEFAULT_CONCURRENCY, handler
+
+C = TypeVar("C")
+
+# The scales used by `Wallpaper.readable_size`, from the smallest to the largest.
+_SCALES = (
+    (1000 ** 0, "B"),
+    (1000 ** 1, "kB"),
+    (1000 ** 2, "MB"),
+    (1000 ** 3, "GB"),
+    (1000 ** 4, "TB"),
+    (1000 ** 5, "PB"),
+)
+
+# The file extensions used by `Wallpaper.extension`, by MIME type.
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png"}
+
+
+def _slotted(cls: Type[C]) -> Type[C]:
+    """Return a copy of the dataclass `cls` that uses `__slots__`.
+
+    Instances of slotted classes don't carry a `__dict__`, which makes them smaller and
+    their attributes slightly faster to access. This matters for listings, where dozens
+    of wallpapers are created for every page.
+
+    This is a backport of `dataclass(slots=True)`, which is only available in Python
+    3.10+. It must be applied on top of `@dataclass`.
+    """
+    cls_dict = dict(cls.__dict__)
+
+    # `C` can't be bound to "any dataclass", since typeshed's `DataclassInstance`
+    # protocol doesn't exist at runtime, so `cls` is treated as `Any` from here on.
+    dataclass_cls: Any = cls
+
+    # Fields inherited from a slotted base class already have a slot.
+    inherited: Set[str] = set()
+    for base in cls.__mro__[1:-1]:
+        inherited.update(getattr(base, "__slots__", ()))
+
+    field_names = tuple(f.name for f in fields(dataclass_cls))
+    cls_dict["__slots__"] = tuple(n for n in field_names if n not in inherited)
+
+    # The fields in the same order as the parameters of `__init__`. This lets
+    # `from_dict` pass the values positionally.
+    cls_dict["_field_names"] = field_names
+
+    # Default values are kept by the generated `__init__`, so the class attributes can
+    # be removed. They would otherwise conflict with the slots.
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    # The `__setattr__` and `__delattr__` generated for frozen dataclasses refer to
+    # the original class, which breaks for the new one, so they are replaced. And
+    # since they always raise, instances can't be unpickled through `__setattr__`.
+    if dataclass_cls.__dataclass_params__.frozen:
+        cls_dict["__setattr__"] = _frozen_setattr
+        cls_dict["__delattr__"] = _frozen_delattr
+        cls_dict["__getstate__"] = _get_state
+        cls_dict["__setstate__"] = _set_state
+
+    metaclass: Any = type(cls)
+    return cast(Type[C], metaclass(cls.__name__, cls.__bases__, cls_dict))
+
+
+def _frozen_setattr(self, name: str, value: Any) -> None:
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _frozen_delattr(self, name: str) -> None:
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+def _get_state(self) -> List[Any]:
+    return [getattr(self, f.name) for f in fields(self)]
+
+
+def _set_state(self, state: List[Any]) -> None:
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)
 
 
 class WallhavenModel:
     """Base model class with methods that other models will inherit."""
 
-    def __init__(self, **kwargs) -> None:
-        self._data: Dict[str, Any] = {}
+    __slots__ = ()
+    _field_names: Tuple[str, ...] = ()
 
     def as_dict(self) -> Dict[str, Any]:
-        """Return the instance as a dictionary."""
-        return self._data
+        """Return the instance as a dictionary.
+
+        The dictionary is built from the instance's fields (recursively) when this
+        method is called, so nothing needs to be kept around while parsing responses.
+        """
+        # Every subclass is a dataclass, even though this base class isn't one.
+        return asdict(cast(Any, self))
 
     def as_json(self, **kwargs) -> str:
         """Return the instance as a JSON string.
 
+        Without any arguments, the string is compact and non-ASCII characters are
+        not escaped, e.g. `{"name":"café"}`. It's serialized with `orjson` if it's
+        installed. Pass `json.dumps` arguments, such as `indent`, to format it
+        differently.
+
         Args:
             **kwargs: Optional keyword arguments that `json.dumps` takes.
         """
+        if not kwargs:
+            return dumps(self.as_dict())
         return json.dumps(self.as_dict(), **kwargs)
 
     @classmethod
@@ -33,13 +140,18 @@ class WallhavenModel:
         """Return an instance of `cls` from `data`.
 
         Args:
-            data (dict): The data returned from the API.
+            data (dict): The data returned from the API. It is not modified. Keys that
+                don't match a field are ignored.
+
+        Raises:
+            KeyError: If a field is missing from `data`.
         """
-        # Save the original data.
-        cls._data = data.copy()
-        return cls(**data)
+        # Passing the values positionally is cheaper than unpacking `data` as keyword
+        # arguments, which adds up for the dozens of tags in a page of wallpapers.
+        return cls(*[data[name] for name in cls._field_names])
 
 
+@_slotted
 @dataclass(frozen=True)
 class Wallpaper(WallhavenModel):
     """Represents a Wallpaper.
@@ -105,25 +217,15 @@ class Wallpaper(WallhavenModel):
     @property
     def extension(self) -> str:
         """Convert file MIME type to extension."""
-        return ".jpg" if self.file_type == "image/jpeg" else ".png"
+        return _EXTENSIONS.get(self.file_type, ".png")
 
     @property
     def readable_size(self) -> str:
         """Return the file size as a human friendly KB, MB, GB, TB or PB string."""
-        base = 1000
-        scales = [
-            (base ** 5, "PB"),
-            (base ** 4, "TB"),
-            (base ** 3, "GB"),
-            (base ** 2, "MB"),
-            (base ** 1, "kB"),
-            (base ** 0, "B"),
-        ]
-
-        for scale in scales:
-            if self.file_size >= scale[0]:
-                break
-        return "%.2f%s" % (self.file_size / scale[0], scale[1])
+        # Every 3 digits, the size moves up to the next scale.
+        index = min((len(str(self.file_size)) - 1) // 3, len(_SCALES) - 1)
+        scale, unit = _SCALES[index]
+        return "%.2f%s" % (self.file_size / scale, unit)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> Wallpaper:
@@ -135,16 +237,17 @@ class Wallpaper(WallhavenModel):
 
         Returns:
             Wallpaper: A new instance of a `Wallpaper` object.
-        """
-        # Save the original data.
-        cls._data = data.copy()
 
+        Raises:
+            KeyError: If a field is missing from `data`.
+        """
         # Convert tags and uploaders to objects.
-        tags = [Tag.from_dict(tag) for tag in data.pop("tags")]
-        uploader = Uploader.from_dict(data.pop("uploader"))
+        tags = [Tag.from_dict(tag) for tag in data["tags"]]
+        uploader = Uploader.from_dict(data["uploader"])
 
         # Return an instance of Wallpaper with the converted tags and uploader.
-        return cls(tags=tags, uploader=uploader, **data)
+        values = {name: data[name] for name in _LISTING_FIELDS}
+        return cls(**values, tags=tags, uploader=uploader)
 
     @classmethod
     def from_listing_data(cls, data: Dict[str, Any]) -> Wallpaper:
@@ -156,12 +259,14 @@ class Wallpaper(WallhavenModel):
 
         Returns:
             Wallpaper: A new instance of a `Wallpaper` object.
-        """
-        # Save the original data.
-        cls._data = data.copy()
 
-        # Return an instance of Wallpaper with default tags and uploader.
-        return cls(**data)
+        Raises:
+            KeyError: If a field is missing from `data`.
+        """
+        # Return an instance of Wallpaper with default tags and uploader. This runs for
+        # every wallpaper in a listing, so the values are passed positionally. That's
+        # safe because `_LISTING_FIELDS` are the first fields, see below.
+        return cls(*[data[name] for name in _LISTING_FIELDS])
 
     def save(self, path: Union[Path, str], override: bool = False) -> None:
         """Download wallpaper and save it in `path`.
@@ -170,6 +275,8 @@ class Wallpaper(WallhavenModel):
         format is `wallhaven-{id}{extension}`, e.g., `wallhaven-8oxreo.png`.
 
         Users may choose whether to override existing files or simply skip the download.
+        Symbolic links are followed, so a link to a missing file doesn't count as an
+        existing file and the wallpaper is saved where it points.
 
         Args:
             path (Path | str): The directory where the wallpaper will be saved.
@@ -183,10 +290,6 @@ class Wallpaper(WallhavenModel):
         if not isinstance(path, Path):
             path = Path(path)
 
-        # Create directory and parent folders.
-        if not path.exists():
-            path.mkdir(parents=True)
-
         # Get the file name, i.e., wallhaven-8oxreo.png.
         filename = f"wallhaven-{self.id}{self.extension}"
 
@@ -194,14 +297,20 @@ class Wallpaper(WallhavenModel):
         filepath = path.joinpath(filename)
 
         # Only downloads if the file doesn't exist or if `override` if set to True.
-        if not filepath.exists() or override:
-            response = handler.get(self.path, stream=True, timeout=20)
-            with open(filepath, "wb+") as img_file:
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk:
-                        img_file.write(chunk)
+        if override or not filepath.exists():
+            handler.download(self.path, filepath, timeout=20)
+
 
+# The fields that every wallpaper has, i.e. all but `tags` and `uploader`, which are
+# missing from listings. They must come first, so they can be passed positionally.
+_LISTING_FIELDS = tuple(
+    n for n in Wallpaper._field_names if n not in ("tags", "uploader")
+)
+if Wallpaper._field_names[: len(_LISTING_FIELDS)] != _LISTING_FIELDS:
+    raise TypeError("`tags` and `uploader` must be the last fields of `Wallpaper`.")
 
+
+@_slotted
 @dataclass
 class Tag(WallhavenModel):
     """Represents a Tag.
@@ -226,6 +335,7 @@ class Tag(WallhavenModel):
     created_at: str
 
 
+@_slotted
 @dataclass
 class Uploader(WallhavenModel):
     """Represents an Uploader.
@@ -244,6 +354,7 @@ class Uploader(WallhavenModel):
     avatar: Dict[str, str] = field(repr=False)
 
 
+@_slotted
 @dataclass
 class UserSettings(WallhavenModel):
     """Represents an user's browsing settings.
@@ -277,6 +388,7 @@ class UserSettings(WallhavenModel):
     user_blacklist: List[str]
 
 
+@_slotted
 @dataclass
 class Collection(WallhavenModel):
     """Represents a collection.
@@ -310,6 +422,53 @@ class Collection(WallhavenModel):
         return bool(self.public)
 
 
+class _LazyWallpapers(Sequence[Wallpaper]):
+    """A read-only list of wallpapers that are built the first time they are accessed.
+
+    A page of results holds up to 64 wallpapers, but often only a few of them (or just
+    the meta information) are used. Each `Wallpaper` is created from its raw data on
+    first access and then cached, so iterating the list again returns the same objects.
+
+    The list isn't thread-safe: if several threads access a wallpaper for the first
+    time at once, each of them may build (and get) its own, equal copy of it.
+    """
+
+    __slots__ = ("_raw", "_wallpapers")
+
+    # The list is compared by value, like a `list`, so it can't be hashed either.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, raw: List[Dict[str, Any]]) -> None:
+        self._raw = raw
+        self._wallpapers: List[Optional[Wallpaper]] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        wallpaper = self._wallpapers[index]
+        if wallpaper is None:
+            wallpaper = Wallpaper.from_listing_data(self._raw[index])
+            self._wallpapers[index] = wallpaper
+        return wallpaper
+
+    def __iter__(self) -> Iterator[Wallpaper]:
+        for index in range(len(self._raw)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+@_slotted
 @dataclass
 class BaseListing(WallhavenModel):
     """Base listing class.
@@ -317,26 +476,64 @@ class BaseListing(WallhavenModel):
     This is a model that will be inherited from `CollectionListing` and `SearchResults`.
 
     Attributes:
-        data (list): A list of `Wallpaper` objects. These objects come without
-            information about the `Tags` and the `Uploader`.
+        data (Sequence[Wallpaper]): The wallpapers in the listing. These objects come
+            without information about the `Tags` and the `Uploader`. When parsed from
+            the API, each wallpaper is only created the first time it's accessed.
         meta (Meta): An instance of `Meta`. It contains metadata about the listing and
             can also be used for pagination.
     """
 
-    data: List[Wallpaper]
+    data: Sequence[Wallpaper]
     meta: Meta
 
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the instance as a dictionary."""
+        # `asdict` only recurses into lists and tuples, so the wallpapers are
+        # converted one by one.
+        return {
+            "data": [wallpaper.as_dict() for wallpaper in self.data],
+            "meta": self.meta.as_dict(),
+        }
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
-        """Return an instance of `cls` from `data`."""
-        cls._data = data.copy()
+        """Return an instance of `cls` from `data`.
 
-        wallpapers = [Wallpaper.from_listing_data(w) for w in data.pop("data")]
-        meta = Meta.from_dict(data.pop("meta"))
+        Only `meta` is parsed right away. The wallpapers are created as they are
+        accessed, see `_LazyWallpapers`.
+        """
+        wallpapers = _LazyWallpapers(data["data"])
+        meta = Meta.from_dict(data["meta"])
 
         return cls(data=wallpapers, meta=meta)
 
+    def save_all(
+        self,
+        path: Union[Path, str],
+        override: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Download every wallpaper in the listing and save them in `path`.
 
+        The downloads run in a pool of threads, since most of the time is spent
+        waiting for the network. See `Wallpaper.save` for how files are named.
+
+        Args:
+            path (Path | str): The directory where the wallpapers will be saved.
+            override (bool): Whether to override existing files.
+            max_workers (int | None): The maximum number of simultaneous downloads.
+                Defaults to the same concurrency as `Wallhaven`, 8 downloads.
+        """
+        # Create the directory up front, so the threads don't race to create it.
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers or DEFAULT_CONCURRENCY) as executor:
+            # Consume the results, so that errors are raised here.
+            list(executor.map(lambda w: w.save(path, override), self.data))
+
+
+@_slotted
 @dataclass
 class CollectionListing(BaseListing):
     """Represents the listing of wallpapers inside a collection.
@@ -348,6 +545,7 @@ class CollectionListing(BaseListing):
     pass
 
 
+@_slotted
 @dataclass(frozen=True)
 class Meta(WallhavenModel):
     """Represents the Meta field in the API response.
@@ -388,7 +586,17 @@ class Meta(WallhavenModel):
     # there are no repeats when getting a new page.
     seed: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Meta:
+        """Return an instance of Meta from `data`.
+
+        Unlike the other models, some fields are optional, so `data` is passed as
+        keyword arguments.
+        """
+        return cls(**data)
+
 
+@_slotted
 @dataclass
 class SearchResults(BaseListing):
     """Represents the search results.
@@ -0,0 +1,154 @@
+"""Provides limiters to keep requests within the Wallhaven API rate limit.
+
+From the official docs: API calls are currently limited to 45 per minute. Instead of
+letting the API return `429 - Too many requests`, the limiters wait until a new
+request can be made.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Optional
+
+
+class _BaseLimiter:
+    """Keeps track of the requests made in the last `window` seconds."""
+
+    def __init__(self, limit: int = 45, window: float = 60.0) -> None:
+        """Initialize a limiter.
+
+        Args:
+            limit (int): The maximum amount of requests allowed in the window.
+            window (float): The length of the window in seconds.
+        """
+        self.limit = limit
+        self.window = window
+        self._calls: Deque[float] = deque()
+
+    def _reserve(self) -> float:
+        """Try to reserve a request.
+
+        Returns:
+            The time (in seconds) to wait before trying again, or 0 if the request was
+            reserved and can be made right away.
+        """
+        now = time.monotonic()
+        while self._calls and self._calls[0] <= now - self.window:
+            self._calls.popleft()
+
+        if len(self._calls) >= self.limit:
+            return self._calls[0] + self.window - now
+
+        self._calls.append(now)
+        return 0
+
+
+class SlidingWindowLimiter(_BaseLimiter):
+    """A thread-safe limiter for synchronous requests.
+
+    Usage:
+
+    >>> limiter = SlidingWindowLimiter(limit=45, window=60)
+    >>> limiter.acquire()  # Blocks until a request can be made.
+    """
+
+    def __init__(self, limit: int = 45, window: float = 60.0) -> None:
+        """Initialize a limiter. See `_BaseLimiter` for the arguments."""
+        super().__init__(limit, window)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request can be made."""
+        with self._lock:
+            delay = self._reserve()
+            while delay:
+                time.sleep(delay)
+                delay = self._reserve()
+
+
+class AsyncSlidingWindowLimiter(_BaseLimiter):
+    """A limiter for asynchronous requests.
+
+    Usage:
+
+    >>> limiter = AsyncSlidingWindowLimiter(limit=45, window=60)
+    >>> await limiter.acquire()  # Waits until a request can be made.
+    """
+
+    def __init__(self, limit: int = 45, window: float = 60.0) -> None:
+        """Initialize a limiter. See `_BaseLimiter` for the arguments."""
+        super().__init__(limit, window)
+
+        # The lock is only created when it's first needed, so that it belongs to the
+        # running event loop instead of the one (if any) that was running when the
+        # limiter was created. Since the limiter is shared, it may also outlive a
+        # loop, e.g. when `asyncio.run` is called more than once, so a new lock is
+        # created whenever the loop changes.
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self) -> None:
+        """Wait until a request can be made."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            delay = self._reserve()
+            while delay:
+                await asyncio.sleep(delay)
+                delay = self._reserve()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse the value of a `Retry-After` header.
+
+    The header holds either a number of seconds or an HTTP-date.
+
+    Args:
+        value (str | None): The value of the header, e.g "30" or
+            "Wed, 21 Oct 2015 07:28:00 GMT".
+
+    Returns:
+        The time (in seconds) to wait before retrying, or None if the value is missing
+        or invalid.
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None or date.tzinfo is None:
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+def backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Return how long to wait before retrying a request.
+
+    The delay grows exponentially with each attempt, up to `cap`, plus a random
+    jitter, so that concurrent requests don't all retry at the same moment.
+
+    Args:
+        attempt (int): How many times the request has been retried so far.
+        base (float): The delay (in seconds) before the first retry.
+        cap (float): The maximum delay (in seconds), without the jitter.
+    """
+    return min(base * 2 ** attempt, cap) + random.uniform(0, base)
+
+
+# Every `Wallhaven` instance shares the same limiter, since the limit applies to all
+# requests made by the user. The same goes for every `AsyncWallhaven` instance.
+limiter = SlidingWindowLimiter()
+async_limiter = AsyncSlidingWindowLimiter()
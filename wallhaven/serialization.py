@@ -0,0 +1,50 @@
+"""Provides helpers to parse and serialize JSON, using `orjson` when it's available.
+
+`orjson` is an optional dependency that handles JSON considerably faster than the
+standard library. It can be installed with `pip install wallhaven[orjson]`. When it's
+not installed, the standard `json` module is used instead.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize a JSON document.
+
+    Args:
+        data (bytes | str): The JSON document. Passing the raw bytes of a response is
+            preferred, since it avoids decoding them into a string first.
+
+    Returns:
+        The deserialized Python object.
+
+    Raises:
+        ValueError: If `data` doesn't contain a valid JSON document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize `obj` as a compact JSON string.
+
+    The output is the same whether `orjson` is installed or not: no whitespace between
+    items and non-ASCII characters written as is, e.g. `{"name":"café"}`.
+
+    Args:
+        obj: Any object made of dictionaries, lists, strings, numbers, booleans and
+            None.
+
+    Returns:
+        The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
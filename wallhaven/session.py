@@ -1,10 +1,28 @@
 """Provides RequestHandler to handle synchronous GET requests."""
 
-from typing import Any, Dict, Optional
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Set
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from wallhaven.cache import TTLCache
 from wallhaven.exceptions import ApiKeyError, TooManyRequestsError
+from wallhaven.ratelimit import SlidingWindowLimiter, backoff, parse_retry_after
+from wallhaven.serialization import loads
+
+# Wallpapers are downloaded in 1 MiB chunks, which means far fewer writes while
+# keeping the memory usage low.
+CHUNK_SIZE = 1 << 20
+
+# How many requests (or downloads) the bulk methods send at the same time by default.
+DEFAULT_CONCURRENCY = 8
 
 
 class RequestHandler:
@@ -20,10 +38,69 @@ class RequestHandler:
     <Response [200]>
     """
 
-    def __init__(self, timeout: Optional[int] = None) -> None:
+    __slots__ = (
+        "timeout",
+        "retries",
+        "limiter",
+        "session",
+        "cache",
+        "_refresher",
+        "_refreshing",
+        "_inflight",
+        "_inflight_lock",
+        "_closed",
+    )
+
+    def __init__(
+        self,
+        timeout: Optional[int] = None,
+        retries: int = 3,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        cache: Optional[TTLCache] = None,
+        limiter: Optional[SlidingWindowLimiter] = None,
+    ) -> None:
         self.timeout = timeout
+        self.retries = retries
+        self.limiter = limiter
         self.session = requests.Session()
 
+        # Responses requested through `get_json` with a `ttl` are kept in the cache.
+        # Stale entries are refreshed by a background worker, so users don't need to
+        # wait for the network while the entry is still valid.
+        self.cache = cache
+        self._refresher = ThreadPoolExecutor(max_workers=1)
+        self._refreshing: Set[str] = set()
+
+        # Requests for the same cache key that are sent at the same time, e.g. by the
+        # threads in `Wallhaven.get_wallpapers`, share a single request instead of
+        # each one hitting the network.
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._closed = False
+
+        # A `Session` keeps its connections alive, so every request sent through the
+        # same handler reuses them instead of going through a new TCP and TLS
+        # handshake. The adapter lets us choose how many connections are kept in the
+        # pool and retry server errors with an exponential backoff. Once the retries
+        # are exhausted, the last response is returned as is, so it can still be
+        # converted into one of our exceptions by `_check_for_errors`.
+        # 429 responses are retried by `get` instead, so that every attempt waits for
+        # the rate limiter.
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=0.3,
+            status_forcelist=[500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # `requests` offers the shorthand helper `raise_for_status()` which asserts
         # that the response HTTP status code is not a 4xx or a 5xx, i.e that the
         # requests didn't result in a client or a server error. This can get
@@ -33,6 +110,17 @@ class RequestHandler:
         # raise_for_status() is called for each response object.
         self.session.hooks["response"] = [self._check_for_errors]
 
+    def close(self) -> None:
+        """Close the session and stop the background worker.
+
+        Cached responses can still be read afterwards, but stale entries are no
+        longer refreshed in the background.
+        """
+        with self._inflight_lock:
+            self._closed = True
+            self._refresher.shutdown(wait=False)
+        self.session.close()
+
     @staticmethod
     def _check_for_errors(response: requests.Response, *args, **kwargs) -> None:
         """Check for HTTP errors in a `Response` object."""
@@ -47,7 +135,8 @@ class RequestHandler:
             elif response.status_code == 429:
                 raise TooManyRequestsError(
                     "You've exceeded the limit of 45 API calls per minute. Please try "
-                    + "again later!"
+                    + "again later!",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
                 )
             else:
                 raise
@@ -60,22 +149,73 @@ class RequestHandler:
             **kwargs: Optional keyword arguments that `requests.get` takes.
 
         Returns:
-            A `requests.Response` object encoded in UTF-8.
+            A `requests.Response` object. Its encoding is left as sent by the server,
+            so set `response.encoding` before reading `response.text` if needed.
 
         Raises:
             `requests.exceptions.HTTPError`: For any HTTP errors that ocurred.
+            TooManyRequestsError: If the API still responds with `429 - Too many
+                requests` after all retries.
         """
         timeout = kwargs.pop("timeout", self.timeout)
-        response = self.session.get(url, timeout=timeout, **kwargs)
-        response.encoding = "UTF-8"
-        return response
 
-    def get_json(self, url: str, **kwargs) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            # Wait until the request fits within the rate limit.
+            if self.limiter is not None:
+                self.limiter.acquire()
+
+            try:
+                return self.session.get(url, timeout=timeout, **kwargs)
+            except TooManyRequestsError as error:
+                if attempt >= self.retries:
+                    raise
+
+                # Back off exponentially, but never wait less than the server asked
+                # us to.
+                time.sleep(max(backoff(attempt), error.retry_after or 0))
+                attempt += 1
+
+    def download(self, url: str, filepath: Path, **kwargs) -> None:
+        """Stream the body of a GET request into a file.
+
+        The body is never held in memory as a whole, which matters for wallpapers that
+        are several megabytes. The file's directory is created if it doesn't exist.
+
+        Args:
+            url (str): The file to download.
+            filepath (Path): Where the file will be saved. Existing files are
+                overwritten.
+            **kwargs: Optional keyword arguments that `requests.get` takes.
+        """
+        response = self.get(url, stream=True, **kwargs)
+        with response, _open_for_writing(filepath) as file:
+            # The copy loop runs in C, reading straight from the raw stream.
+            # The file keeps its default buffering: chunks larger than the buffer go
+            # straight to the disk, and the buffered writer retries short writes.
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, file, length=CHUNK_SIZE)
+
+            # The file is unlikely to be read again by us, so tell the kernel it
+            # doesn't need to keep it in the page cache (where supported).
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def get_json(
+        self, url: str, ttl: Optional[float] = None, **kwargs
+    ) -> Dict[str, Any]:
         """Send a GET request and parse it as json.
 
+        If the handler has a cache and a `ttl` is given, the response is looked up in
+        the cache first and only requested if it's missing or expired. Entries past
+        half their lifetime are still returned, but refreshed in the background.
+
         Args:
             url (str): The endpoint to request.
-            **kwargs: Optional keyword arguments that `requests.get` takes.
+            ttl (float | None): For how long (in seconds) the response can be cached.
+                The value of `None` means that the response is never cached.
+            **kwargs: Optional keyword arguments that `requests.get` takes. Only
+                `params` is taken into account when looking up the cache.
 
         Returns:
             The json-encoded content of the `Response` object.
@@ -84,8 +224,121 @@ class RequestHandler:
             `requests.exceptions.HTTPError`: For any HTTP errors that ocurred.
             ValueError: If the response body does not contain valid json.
         """
-        response = self.get(url, **kwargs)
-        return response.json()
+        if self.cache is None or ttl is None:
+            return loads(self.get(url, **kwargs).content)
+
+        # The full URL (with the encoded query string) identifies the response. It's
+        # also what gets requested, so the parameters are only encoded once.
+        params = kwargs.pop("params", None)
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        assert full_url is not None
+        entry = self.cache.get(full_url)
+        if entry is None:
+            content = self._fetch(full_url, ttl, **kwargs)
+        else:
+            if entry.is_stale():
+                self._refresh(full_url, ttl, **kwargs)
+            content = entry.content
+
+        # We store the raw bytes instead of the parsed dictionary, since callers are
+        # free to modify the dictionaries they receive.
+        return loads(content)
+
+    def _fetch(self, url: str, ttl: float, **kwargs) -> bytes:
+        """Request `url` and store the body of the response in the cache.
+
+        If the same URL is already being requested, wait for that request to finish
+        and share its result instead of requesting it again.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(url)
+            if future is not None:
+                waiting = True
+            else:
+                waiting = False
+                future = self._inflight[url] = Future()
+
+        if waiting:
+            return future.result()
+
+        try:
+            content = self._revalidate(url, ttl, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(content)
+            return content
+        finally:
+            with self._inflight_lock:
+                del self._inflight[url]
+
+    def _revalidate(self, url: str, ttl: float, **kwargs) -> bytes:
+        """Request `url` and store the response in the cache.
+
+        If an expired entry with an `ETag` is still in the cache, the request is sent
+        with `If-None-Match`. When the server responds with `304 - Not Modified`, the
+        cached body is reused and its lifetime renewed, so nothing needs to be
+        downloaded.
+
+        If the server can't be reached at all, the expired entry (if any) is returned
+        instead. It's left as is, so the next request tries the network again.
+        """
+        previous = self.cache.get(url, include_expired=True)  # type: ignore
+        if previous is not None and previous.etag is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers["If-None-Match"] = previous.etag
+            kwargs["headers"] = headers
+
+        try:
+            response = self.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if previous is None:
+                raise
+            return previous.content
+
+        etag = response.headers.get("ETag")
+        if response.status_code == 304 and previous is not None:
+            # A `304` isn't required to repeat the `ETag`, and the cached body is
+            # still the one it belongs to.
+            content = previous.content
+            etag = etag or previous.etag
+        else:
+            content = response.content
+        self.cache.set(url, content, ttl=ttl, etag=etag)  # type: ignore
+        return content
+
+    def _refresh(self, url: str, ttl: float, **kwargs) -> None:
+        """Refresh a cache entry in the background, unless it's already refreshing.
+
+        Nothing happens once the handler is closed, since the entry is still valid.
+        """
+        with self._inflight_lock:
+            if self._closed or url in self._refreshing:
+                return
+            self._refreshing.add(url)
+            future = self._refresher.submit(self._fetch, url, ttl, **kwargs)
+
+        # Errors are ignored, since the entry is still valid. It will simply be
+        # requested again once it expires.
+        def done(_: Future) -> None:
+            with self._inflight_lock:
+                self._refreshing.discard(url)
+
+        future.add_done_callback(done)
+
+
+def _open_for_writing(filepath: Path) -> BinaryIO:
+    """Open `filepath` for writing, creating its directory and parents if needed.
+
+    When many files are saved to the same directory, it only needs to be created once,
+    so it's only created after opening the file fails.
+    """
+    try:
+        return open(filepath, "wb")
+    except FileNotFoundError:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        return open(filepath, "wb")
 
 
 handler = RequestHandler(timeout=30)